@@ -0,0 +1,249 @@
+"""
+Watch-backed caches of Kubernetes objects for the MCP servers.
+Each informer lists a collection once, then follows a watch from that
+resourceVersion so handlers read cluster state from memory instead of
+issuing a LIST against the apiserver on every request. Objects are kept as
+the apiserver's JSON (plain dicts) rather than generated model classes,
+since handlers only read a handful of fields from each. The summary helpers
+at the bottom turn those dicts into the servers' response entries.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+import orjson
+from kubernetes_asyncio import client as async_client, watch as async_watch
+
+logger = logging.getLogger(__name__)
+
+# Server-side timeout for each watch request; the informer re-watches from the
+# last seen resourceVersion when it expires
+WATCH_TIMEOUT_SECONDS = 300
+
+# Delay before relisting after a watch fails for any reason other than expiry
+RETRY_DELAY_SECONDS = 5
+
+HTTP_STATUS_GONE = 410
+HTTP_STATUS_NOT_FOUND = 404
+
+# (connect, read) timeouts for LIST calls, so a stuck apiserver fails the request
+# instead of holding a pooled connection
+LIST_REQUEST_TIMEOUT = (2.0, 10.0)
+
+# A LIST that fails with one of these statuses or a connection error is retried
+# this many times, backing off exponentially from LIST_RETRY_BACKOFF_SECONDS
+LIST_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+LIST_RETRIES = 2
+LIST_RETRY_BACKOFF_SECONDS = 0.1
+
+# Client-side read timeout for a watch request, so a connection that goes quiet
+# without the apiserver closing it raises and the informer relists
+WATCH_REQUEST_TIMEOUT = (LIST_REQUEST_TIMEOUT[0], WATCH_TIMEOUT_SECONDS + 30)
+
+# Most namespaces a single multi-namespace request may query
+MAX_NAMESPACES = 20
+
+
+class AsyncInformer:
+    """List and watch one resource collection from a background asyncio task."""
+
+    def __init__(self, list_func: Callable, **kwargs):
+        self._list_func = list_func
+        self._kwargs = kwargs
+        self._store: Dict[str, Any] = {}
+        self._resource_version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Do the initial list, then watch in a background task."""
+        await self._relist()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the watch task and wait for it to unwind."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Snapshot of the cached objects."""
+        return list(self._store.values())
+
+    async def _list(self) -> bytes:
+        """LIST the collection, retrying transient failures, and return the raw body."""
+        for attempt in range(LIST_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(LIST_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = await self._list_func(
+                    _preload_content=False, _request_timeout=LIST_REQUEST_TIMEOUT, **self._kwargs
+                )
+                body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == LIST_RETRIES:
+                    raise
+                continue
+            if 200 <= response.status <= 299:
+                return body
+            if response.status not in LIST_RETRY_STATUSES or attempt == LIST_RETRIES:
+                raise async_client.exceptions.ApiException(status=response.status, reason=response.reason)
+
+    async def _relist(self):
+        # Parse the raw body with orjson instead of building a model per item
+        result = orjson.loads(await self._list())
+        self._store = {obj["metadata"]["uid"]: obj for obj in result["items"]}
+        self._resource_version = result["metadata"]["resourceVersion"]
+
+    async def _watch(self):
+        # raw_object is the event's parsed JSON dict. return_type="object" only keeps
+        # Watch from building a model for "object"; it still re-encodes it to get there.
+        async with async_watch.Watch(return_type="object") as w:
+            stream = w.stream(
+                self._list_func,
+                resource_version=self._resource_version,
+                timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                _request_timeout=WATCH_REQUEST_TIMEOUT,
+                **self._kwargs,
+            )
+            async for event in stream:
+                obj = event["raw_object"]
+                metadata = obj["metadata"]
+                if event["type"] == "DELETED":
+                    self._store.pop(metadata["uid"], None)
+                else:
+                    self._store[metadata["uid"]] = obj
+                self._resource_version = metadata["resourceVersion"]
+
+    async def _run(self):
+        while True:
+            try:
+                if self._resource_version is None:
+                    await self._relist()
+                await self._watch()
+                continue
+            except async_client.exceptions.ApiException as e:
+                if e.status == HTTP_STATUS_GONE:
+                    # Our resourceVersion is too old to resume from, relist right away
+                    self._resource_version = None
+                    continue
+                logger.warning("Watch on %s failed: %s", self._list_func.__name__, e.reason)
+            except Exception as e:
+                logger.warning("Watch on %s failed: %s", self._list_func.__name__, e)
+            self._resource_version = None
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+
+class AsyncClusterCache:
+    """Informer-backed namespaces, nodes, and per-namespace pods and deployments."""
+
+    def __init__(
+        self,
+        core_v1: async_client.CoreV1Api,
+        apps_v1: async_client.AppsV1Api,
+        metadata_core_v1: async_client.CoreV1Api,
+    ):
+        # metadata_core_v1 lists namespaces as metadata-only objects; its client
+        # is owned (and closed) by the caller
+        self._core_v1 = core_v1
+        self._apps_v1 = apps_v1
+        self._metadata_core_v1 = metadata_core_v1
+        self._informers: Dict[tuple, AsyncInformer] = {}
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+
+    async def _items(self, key: tuple, list_func: Callable, **kwargs) -> List[Dict[str, Any]]:
+        informer = self._informers.get(key)
+        if informer is None:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                informer = self._informers.get(key)
+                if informer is None:
+                    # A failed initial list propagates to the caller and is retried next time
+                    informer = AsyncInformer(list_func, **kwargs)
+                    await informer.start()
+                    self._informers[key] = informer
+        return informer.items()
+
+    async def _require_namespace(self, namespace: str):
+        """Raise a 404 ApiException unless the namespace exists.
+
+        Callers choose the namespace, so checking it against the namespace
+        informer keeps them from starting a watch per made-up name.
+        """
+        if not any(ns["metadata"]["name"] == namespace for ns in await self.namespaces()):
+            raise async_client.exceptions.ApiException(status=HTTP_STATUS_NOT_FOUND, reason="Not Found")
+
+    async def close(self):
+        """Stop every background watch and wait for the streams to close."""
+        await asyncio.gather(*(informer.stop() for informer in self._informers.values()), return_exceptions=True)
+
+    async def namespaces(self) -> List[Dict[str, Any]]:
+        return await self._items(("namespaces",), self._metadata_core_v1.list_namespace)
+
+    async def nodes(self) -> List[Dict[str, Any]]:
+        return await self._items(("nodes",), self._core_v1.list_node)
+
+    async def pods(self, namespace: str) -> List[Dict[str, Any]]:
+        await self._require_namespace(namespace)
+        return await self._items(("pods", namespace), self._core_v1.list_namespaced_pod, namespace=namespace)
+
+    async def deployments(self, namespace: str) -> List[Dict[str, Any]]:
+        await self._require_namespace(namespace)
+        return await self._items(
+            ("deployments", namespace), self._apps_v1.list_namespaced_deployment, namespace=namespace
+        )
+
+
+def is_ready(conditions) -> bool:
+    """Whether the Ready condition is True."""
+    statuses = {condition["type"]: condition["status"] for condition in conditions or ()}
+    return statuses.get("Ready") == "True"
+
+
+def _ready_count(conditions) -> int:
+    """Number of Ready conditions that are True (condition types are unique, so 0 or 1)."""
+    return 1 if is_ready(conditions) else 0
+
+
+def _restart_sum(container_statuses) -> int:
+    """Total restarts across a pod's containers."""
+    return sum(container.get("restartCount", 0) for container in container_statuses) if container_statuses else 0
+
+
+def pod_info(pod) -> Dict[str, Any]:
+    """Summarize a pod for API responses."""
+    return {
+        "name": pod["metadata"]["name"],
+        "phase": pod["status"].get("phase"),
+        "ready": _ready_count(pod["status"].get("conditions")),
+        "restart_count": _restart_sum(pod["status"].get("containerStatuses"))
+    }
+
+
+def node_info(node) -> Dict[str, Any]:
+    """Summarize a node for API responses."""
+    labels = node["metadata"].get("labels") or {}
+    return {
+        "name": node["metadata"]["name"],
+        "status": "Ready" if is_ready(node["status"].get("conditions")) else "NotReady",
+        "instance_type": labels.get("node.kubernetes.io/instance-type", "unknown"),
+        "zone": labels.get("topology.kubernetes.io/zone", "unknown")
+    }
+
+
+def deployment_info(deployment) -> Dict[str, Any]:
+    """Summarize a deployment for API responses."""
+    return {
+        "name": deployment["metadata"]["name"],
+        "replicas": deployment["spec"].get("replicas"),
+        "ready_replicas": deployment["status"].get("readyReplicas", 0),
+        "available_replicas": deployment["status"].get("availableReplicas", 0)
+    }
+
+
+def namespace_error(namespace: str, error: Exception) -> Dict[str, Any]:
+    """Error entry for a namespace whose listing failed."""
+    if isinstance(error, async_client.exceptions.ApiException):
+        if error.status == HTTP_STATUS_NOT_FOUND:
+            return {"error": f"Namespace '{namespace}' not found"}
+        return {"error": f"API error: {error.reason}"}
+    return {"error": str(error)}
@@ -2,8 +2,16 @@
 """
 Demonstration of natural language queries that would be possible with Claude Desktop + MCP
 """
-import requests
-import json
+import asyncio
+
+from demo_api import fetch_all, partition_nodes
+
+# Namespace icons for the namespace listing; kube-* system namespaces are matched separately
+NAMESPACE_EMOJI = {'mcp-server': '📦', 'karpenter': '⚡'}
+
+def namespace_emoji(ns):
+    """Pick the icon shown next to a namespace."""
+    return '🔧' if 'kube' in ns else NAMESPACE_EMOJI.get(ns, '📋')
 
 def simulate_natural_language_query():
     print("=== Natural Language Query Demo ===")
@@ -11,22 +19,18 @@ def simulate_natural_language_query():
     
     base_url = 'http://a51a58f78b8f84a278b1fe7ddc9aadde-1713856781.us-east-1.elb.amazonaws.com'
     
+    health, cluster, nodes, pods = asyncio.run(fetch_all(base_url))
+    _, karpenter_nodes = partition_nodes(nodes.get('nodes', []))
+    
     # Query 1: "How is my cluster doing?"
     print('👤 You: "How is my cluster doing?"')
     print('🤖 Claude (via MCP): ')
     
-    health = requests.get(f'{base_url}/health').json()
-    cluster = requests.get(f'{base_url}/cluster-info').json()
-    nodes = requests.get(f'{base_url}/nodes').json()
-    
     if health.get('status') == 'healthy':
-        node_list = nodes.get('nodes', [])
-        karpenter_count = sum(1 for n in node_list if n.get('instance_type') != 't3.medium')
-        
         print(f'   ✅ Your cluster "{cluster.get("cluster_name")}" is running perfectly!')
         print(f'   📊 {cluster.get("namespace_count")} namespaces are active')
         print(f'   🖥️  {nodes.get("node_count")} nodes are ready and healthy')
-        print(f'   ⚡ {karpenter_count} Karpenter-managed nodes providing auto-scaling')
+        print(f'   ⚡ {len(karpenter_nodes)} Karpenter-managed nodes providing auto-scaling')
         print(f'   🌐 Located in {cluster.get("region")}')
     else:
         print('   ❌ Your cluster has some issues that need attention')
@@ -37,7 +41,6 @@ def simulate_natural_language_query():
     print('👤 You: "Are my MCP server pods running?"')
     print('🤖 Claude (via MCP): ')
     
-    pods = requests.get(f'{base_url}/pods?namespace=mcp-server').json()
     pod_list = pods.get('pods', [])
     healthy_pods = [p for p in pod_list if p.get('phase') == 'Running' and p.get('ready') > 0]
     
@@ -55,8 +58,6 @@ def simulate_natural_language_query():
     print('👤 You: "What Karpenter nodes do I have?"')
     print('🤖 Claude (via MCP): ')
     
-    karpenter_nodes = [n for n in node_list if n.get('instance_type') != 't3.medium']
-    
     if karpenter_nodes:
         print(f'   🚀 Karpenter has provisioned {len(karpenter_nodes)} nodes for you:')
         for node in karpenter_nodes:
@@ -74,8 +75,7 @@ def simulate_natural_language_query():
     namespaces = cluster.get('namespaces', [])
     print(f'   📂 Your cluster has {len(namespaces)} namespaces:')
     for ns in namespaces:
-        emoji = '🔧' if 'kube' in ns else '📦' if ns == 'mcp-server' else '⚡' if ns == 'karpenter' else '📋'
-        print(f'      {emoji} {ns}')
+        print(f'      {namespace_emoji(ns)} {ns}')
 
 if __name__ == "__main__":
     simulate_natural_language_query()
\ No newline at end of file
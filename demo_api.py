@@ -0,0 +1,34 @@
+"""
+MCP HTTP API helpers shared by the demo and analysis scripts
+"""
+import asyncio
+
+import httpx
+
+async def fetch_all(base_url):
+    """Fetch health, cluster, node and MCP server pod data concurrently."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        responses = await asyncio.gather(
+            client.get('/health'),
+            client.get('/cluster-info'),
+            client.get('/nodes'),
+            client.get('/pods?namespace=mcp-server'),
+        )
+    return [_json(response) for response in responses]
+
+def _json(response):
+    """Decode a response body, raising on HTTP errors instead of parsing an error page as data."""
+    # /health reports an unhealthy cluster as a 500 whose JSON body the scripts display
+    if response.request.url.path != '/health':
+        response.raise_for_status()
+    return response.json()
+
+def partition_nodes(node_list):
+    """Split nodes into static managed (t3.medium) and Karpenter-provisioned nodes."""
+    managed, karpenter = [], []
+    for node in node_list:
+        if node.get('instance_type') == 't3.medium':
+            managed.append(node)
+        else:
+            karpenter.append(node)
+    return managed, karpenter
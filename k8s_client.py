@@ -0,0 +1,86 @@
+"""
+Shared Kubernetes API client for the MCP servers.
+Loads the cluster config once and lazily builds a single ApiClient, so every
+API group a server uses shares one connection pool and TLS context.
+"""
+import logging
+from typing import Optional
+
+from kubernetes_asyncio import client, config
+
+logger = logging.getLogger(__name__)
+
+# Namespaces are only read for their names, so ask the apiserver for
+# PartialObjectMetadata, falling back to full objects where it can't provide it.
+METADATA_ONLY_ACCEPT = (
+    "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+    "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,"
+    "application/json"
+)
+
+_api_client: Optional[client.ApiClient] = None
+_core_v1: Optional[client.CoreV1Api] = None
+_apps_v1: Optional[client.AppsV1Api] = None
+_metadata_client: Optional[client.ApiClient] = None
+_metadata_core_v1: Optional[client.CoreV1Api] = None
+
+
+async def load_config():
+    """Load in-cluster config, falling back to the local kubeconfig."""
+    try:
+        # Try to load in-cluster config first (when running in pod)
+        config.load_incluster_config()
+        logger.info("Loaded in-cluster Kubernetes config")
+    except config.ConfigException:
+        try:
+            # Fall back to local kubeconfig
+            await config.load_kube_config()
+            logger.info("Loaded local Kubernetes config")
+        except Exception as e:
+            logger.warning("Could not load Kubernetes config: %s", e)
+
+
+def get_api_client() -> client.ApiClient:
+    """The shared ApiClient, created from the loaded config on first use."""
+    global _api_client
+    if _api_client is None:
+        _api_client = client.ApiClient(client.Configuration.get_default_copy())
+    return _api_client
+
+
+def get_core_v1() -> client.CoreV1Api:
+    global _core_v1
+    if _core_v1 is None:
+        _core_v1 = client.CoreV1Api(get_api_client())
+    return _core_v1
+
+
+def get_apps_v1() -> client.AppsV1Api:
+    global _apps_v1
+    if _apps_v1 is None:
+        _apps_v1 = client.AppsV1Api(get_api_client())
+    return _apps_v1
+
+
+def get_metadata_core_v1() -> client.CoreV1Api:
+    """CoreV1Api whose requests ask for metadata-only objects.
+
+    The generated API methods overwrite any per-call Accept header, so this
+    needs its own ApiClient with METADATA_ONLY_ACCEPT as a default header.
+    """
+    global _metadata_client, _metadata_core_v1
+    if _metadata_core_v1 is None:
+        _metadata_client = client.ApiClient(get_api_client().configuration)
+        _metadata_client.set_default_header("Accept", METADATA_ONLY_ACCEPT)
+        _metadata_core_v1 = client.CoreV1Api(_metadata_client)
+    return _metadata_core_v1
+
+
+async def close():
+    """Close the shared ApiClients' connection pools."""
+    global _api_client, _core_v1, _apps_v1, _metadata_client, _metadata_core_v1
+    if _api_client is not None:
+        await _api_client.close()
+    if _metadata_client is not None:
+        await _metadata_client.close()
+    _api_client = _core_v1 = _apps_v1 = _metadata_client = _metadata_core_v1 = None
@@ -2,8 +2,9 @@
 """
 Analysis of production value for MCP EKS setup
 """
-import requests
-import json
+import asyncio
+
+from demo_api import fetch_all, partition_nodes
 
 def analyze_production_value():
     base_url = 'http://a51a58f78b8f84a278b1fe7ddc9aadde-1713856781.us-east-1.elb.amazonaws.com'
@@ -12,17 +13,13 @@ def analyze_production_value():
     print("=" * 50)
     
     # Get current data
-    health = requests.get(f'{base_url}/health').json()
-    cluster = requests.get(f'{base_url}/cluster-info').json()
-    nodes = requests.get(f'{base_url}/nodes').json()
-    pods = requests.get(f'{base_url}/pods?namespace=mcp-server').json()
+    health, cluster, nodes, pods = asyncio.run(fetch_all(base_url))
     
     print("\n1️⃣ COST OPTIMIZATION")
     print("-" * 30)
     
     # Analyze nodes for cost optimization
-    managed_nodes = [n for n in nodes['nodes'] if n['instance_type'] == 't3.medium']
-    karpenter_nodes = [n for n in nodes['nodes'] if n['instance_type'] != 't3.medium']
+    managed_nodes, karpenter_nodes = partition_nodes(nodes['nodes'])
     
     print(f"Static Managed Nodes: {len(managed_nodes)} x t3.medium (always running)")
     print(f"Karpenter Nodes: {len(karpenter_nodes)} x dynamic sizing")
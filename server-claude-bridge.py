@@ -4,11 +4,16 @@ MCP Server bridge that connects Claude Desktop to the HTTP API.
 This enables natural language queries about your EKS cluster.
 """
 import asyncio
-import json
+import io
 import logging
 import os
-import requests
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import orjson
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
@@ -27,138 +32,300 @@ server = Server("eks-mcp-bridge")
 # MCP Server HTTP API endpoint
 MCP_API_BASE = os.getenv("MCP_API_BASE", "http://a51a58f78b8f84a278b1fe7ddc9aadde-1713856781.us-east-1.elb.amazonaws.com")
 
-def call_mcp_api(endpoint: str) -> Dict[str, Any]:
+# Shared async HTTP client so every tool call reuses keep-alive connections to the ELB.
+# Opened in main() for the lifetime of the process.
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Seconds an idle upstream connection is kept for reuse. Below the load
+# balancer's 60s idle timeout, so we never send a request down a connection
+# it has already dropped.
+KEEPALIVE_EXPIRY_SECONDS = 55
+
+@dataclass(slots=True)
+class Node:
+    name: str = "unknown"
+    instance_type: str = "unknown"
+    zone: str = "unknown"
+    status: str = "unknown"
+
+@dataclass(slots=True)
+class Pod:
+    name: str = "unknown"
+    phase: str = "unknown"
+    ready: int = 0
+    restart_count: int = 0
+
+@dataclass(slots=True)
+class Deployment:
+    name: str = "unknown"
+    replicas: int = 0
+    ready_replicas: int = 0
+    available_replicas: int = 0
+
+# List endpoints whose items are parsed into typed records: path -> (list key, record type)
+_ITEM_TYPES = {
+    "/nodes": ("nodes", Node),
+    "/pods": ("pods", Pod),
+    "/deployments": ("deployments", Deployment),
+}
+_ITEM_FIELDS = {cls: tuple(f.name for f in fields(cls)) for _, cls in _ITEM_TYPES.values()}
+
+def _parse_items(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the item dicts of a list response with typed records, in place."""
+    item_type = _ITEM_TYPES.get(endpoint.split("?", 1)[0])
+    if item_type is not None:
+        key, cls = item_type
+        items = data.get(key)
+        if items is not None:
+            names = _ITEM_FIELDS[cls]
+            data[key] = [cls(**{k: item[k] for k in names if k in item}) for item in items]
+    return data
+
+# Last ETag and parsed body per endpoint, for conditional GETs. Endpoints carry
+# caller-chosen namespaces, so only the most recently used ones are kept.
+_ETAG_ENTRIES = 64
+_etags: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+async def call_mcp_api(endpoint: str) -> Dict[str, Any]:
     """Call the MCP HTTP API."""
     try:
-        url = f"{MCP_API_BASE}{endpoint}"
-        response = requests.get(url, timeout=10)
+        known = _etags.get(endpoint)
+        if known:
+            _etags.move_to_end(endpoint)
+        headers = {"If-None-Match": known[0]} if known else None
+        response = await _CLIENT.get(endpoint, headers=headers)
+        if response.status_code == 304 and known:
+            return known[1]
         response.raise_for_status()
-        return response.json()
+        logger.debug("%s served over %s", endpoint, response.http_version)
+        data = _parse_items(endpoint, orjson.loads(response.content))
+        etag = response.headers.get("ETag")
+        if etag:
+            _etags[endpoint] = (etag, data)
+            _etags.move_to_end(endpoint)
+            if len(_etags) > _ETAG_ENTRIES:
+                _etags.popitem(last=False)
+        return data
     except Exception as e:
-        logger.error(f"Error calling MCP API {endpoint}: {e}")
+        logger.error("Error calling MCP API %s: %s", endpoint, e)
         return {"error": str(e)}
 
+# Callers waiting on each endpoint that is currently being fetched upstream
+_in_flight: Dict[str, List[asyncio.Future]] = {}
+# The event loop only keeps weak references to tasks, so hold running fetches here
+_dispatch_tasks: Set[asyncio.Task] = set()
+
+async def _dispatch(endpoint: str) -> None:
+    """Fetch one endpoint and resolve every caller waiting on it."""
+    # Callers always get an answer, even if the fetch is cancelled or raises
+    result: Dict[str, Any] = {"error": f"Request to {endpoint} was cancelled"}
+    try:
+        result = await call_mcp_api(endpoint)
+    except Exception as e:
+        result = {"error": str(e)}
+    finally:
+        for waiter in _in_flight.pop(endpoint, []):
+            if not waiter.done():
+                waiter.set_result(result)
+
+async def _fetch(endpoint: str) -> Dict[str, Any]:
+    """Fetch an endpoint upstream, sharing one request among concurrent callers."""
+    waiter = asyncio.get_running_loop().create_future()
+    waiters = _in_flight.get(endpoint)
+    if waiters is not None:
+        # Already being fetched, piggyback on that request
+        waiters.append(waiter)
+    else:
+        _in_flight[endpoint] = [waiter]
+        task = asyncio.create_task(_dispatch(endpoint))
+        _dispatch_tasks.add(task)
+        task.add_done_callback(_dispatch_tasks.discard)
+    return await waiter
+
+# Seconds a successful response stays fresh, keyed by endpoint path
+_CACHE_TTL = {
+    "/health": 5.0,
+    "/cluster-info": 30.0,
+    "/nodes": 30.0,
+    "/pods": 2.0,
+    "/deployments": 2.0,
+}
+# Endpoints carry caller-chosen namespaces, so only the most recently used are kept
+_CACHE_ENTRIES = 64
+_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+async def _cached(endpoint: str) -> Dict[str, Any]:
+    """Call the MCP HTTP API, reusing a recent response for the same endpoint."""
+    ttl = _CACHE_TTL.get(endpoint.split("?", 1)[0], 0.0)
+    if not ttl:
+        return await _fetch(endpoint)
+
+    hit = _cache.get(endpoint)
+    if hit and time.monotonic() - hit[0] < ttl:
+        _cache.move_to_end(endpoint)
+        return hit[1]
+
+    # Concurrent misses for the same endpoint share one upstream request
+    value = await _fetch(endpoint)
+    if "error" not in value:
+        _cache[endpoint] = (time.monotonic(), value)
+        _cache.move_to_end(endpoint)
+        if len(_cache) > _CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return value
+
+# Seconds a rendered resource document is reused, keyed by resource URI
+_RESOURCE_TTL = 5.0
+_serialized_cache: Dict[str, Tuple[float, str]] = {}
+
+# Resource listing is static, so it is built once at import
+_RESOURCES = [
+    Resource(
+        uri=AnyUrl("resource://cluster-status"),
+        name="EKS Cluster Status",
+        description="Real-time status of your EKS cluster including nodes and health",
+        mimeType="application/json",
+    ),
+    Resource(
+        uri=AnyUrl("resource://pod-status"),
+        name="Pod Status",
+        description="Status of all pods across namespaces",
+        mimeType="application/json",
+    ),
+]
+
 @server.list_resources()
 async def handle_list_resources() -> List[Resource]:
     """List available resources."""
-    return [
-        Resource(
-            uri=AnyUrl("resource://cluster-status"),
-            name="EKS Cluster Status",
-            description="Real-time status of your EKS cluster including nodes and health",
-            mimeType="application/json",
-        ),
-        Resource(
-            uri=AnyUrl("resource://pod-status"),
-            name="Pod Status",
-            description="Status of all pods across namespaces",
-            mimeType="application/json",
-        ),
-    ]
+    return _RESOURCES
 
 @server.read_resource()
 async def handle_read_resource(uri: AnyUrl) -> str:
     """Read a specific resource."""
-    if str(uri) == "resource://cluster-status":
-        cluster_info = call_mcp_api("/cluster-info")
-        nodes = call_mcp_api("/nodes")
-        health = call_mcp_api("/health")
+    key = str(uri)
+    hit = _serialized_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _RESOURCE_TTL:
+        return hit[1]
+    
+    if key == "resource://cluster-status":
+        cluster_info, nodes, health = await asyncio.gather(
+            _cached("/cluster-info"),
+            _cached("/nodes"),
+            _cached("/health"),
+        )
         
         status = {
             "cluster": cluster_info,
             "nodes": nodes,
             "health": health
         }
-        return json.dumps(status, indent=2)
+        failed = any("error" in part for part in status.values())
     
-    elif str(uri) == "resource://pod-status":
-        mcp_pods = call_mcp_api("/pods?namespace=mcp-server")
-        default_pods = call_mcp_api("/pods?namespace=default")
-        karpenter_pods = call_mcp_api("/pods?namespace=karpenter")
+    elif key == "resource://pod-status":
+        pods = await _cached("/pods?namespaces=mcp-server,default,karpenter")
         
-        status = {
-            "mcp_server": mcp_pods,
-            "default": default_pods,
-            "karpenter": karpenter_pods
-        }
-        return json.dumps(status, indent=2)
+        if "error" in pods:
+            status = {"error": pods["error"]}
+        else:
+            status = {
+                "mcp_server": pods.get("mcp-server", {}),
+                "default": pods.get("default", {}),
+                "karpenter": pods.get("karpenter", {})
+            }
+        # The server reports a failed namespace inside its entry, not at the top level
+        failed = "error" in status or any("error" in part for part in status.values())
     
     else:
         raise ValueError(f"Unknown resource: {uri}")
+    
+    text = orjson.dumps(status, option=orjson.OPT_INDENT_2).decode()
+    if not failed:
+        _serialized_cache[key] = (time.monotonic(), text)
+    return text
 
-@server.list_tools()
-async def handle_list_tools() -> List[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="check_cluster_health",
-            description="Check the overall health of your EKS cluster",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-            },
-        ),
-        Tool(
-            name="get_node_info",
-            description="Get detailed information about cluster nodes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_karpenter_only": {
-                        "type": "boolean",
-                        "description": "Show only Karpenter-managed nodes",
-                        "default": False
-                    }
-                },
+# Tool listing is static, so it is built once at import
+_TOOLS = [
+    Tool(
+        name="check_cluster_health",
+        description="Check the overall health of your EKS cluster (API reachability is probed by the server every 10 seconds)",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_node_info",
+        description="Get detailed information about cluster nodes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_karpenter_only": {
+                    "type": "boolean",
+                    "description": "Show only Karpenter-managed nodes",
+                    "default": False
+                }
             },
-        ),
-        Tool(
-            name="check_pods",
-            description="Check the status of pods in a specific namespace",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "namespace": {
-                        "type": "string",
-                        "description": "Kubernetes namespace to check",
-                        "default": "mcp-server",
-                    }
-                },
+        },
+    ),
+    Tool(
+        name="check_pods",
+        description="Check the status of pods in a specific namespace",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "namespace": {
+                    "type": "string",
+                    "description": "Kubernetes namespace to check",
+                    "default": "mcp-server",
+                }
             },
-        ),
-        Tool(
-            name="get_deployments",
-            description="Get deployment status and replica information",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "namespace": {
-                        "type": "string",
-                        "description": "Kubernetes namespace to check",
-                        "default": "default",
-                    }
-                },
+        },
+    ),
+    Tool(
+        name="get_deployments",
+        description="Get deployment status and replica information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "namespace": {
+                    "type": "string",
+                    "description": "Kubernetes namespace to check",
+                    "default": "default",
+                }
             },
-        ),
-    ]
+        },
+    ),
+]
+
+@server.list_tools()
+async def handle_list_tools() -> List[Tool]:
+    """List available tools."""
+    return _TOOLS
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls with natural language responses."""
     
     if name == "check_cluster_health":
-        health = call_mcp_api("/health")
-        cluster_info = call_mcp_api("/cluster-info")
-        nodes = call_mcp_api("/nodes")
+        health, cluster_info, nodes = await asyncio.gather(
+            _cached("/health"),
+            _cached("/cluster-info"),
+            _cached("/nodes"),
+        )
         
         if health.get("status") == "healthy":
+            ready_count = karpenter_count = 0
+            for node in nodes.get("nodes", ()):
+                ready_count += node.status == "Ready"
+                karpenter_count += node.instance_type != "t3.medium"
+            
             response = f"""✅ Your EKS cluster '{cluster_info.get('cluster_name', 'unknown')}' is healthy!
 
 🏗️ Cluster: {cluster_info.get('cluster_name')} in {cluster_info.get('region')}
 📊 Namespaces: {cluster_info.get('namespace_count', 0)}
 🖥️ Nodes: {nodes.get('node_count', 0)} total
-   • Ready nodes: {len([n for n in nodes.get('nodes', []) if n.get('status') == 'Ready'])}
-   • Karpenter nodes: {len([n for n in nodes.get('nodes', []) if n.get('instance_type') != 't3.medium'])}
+   • Ready nodes: {ready_count}
+   • Karpenter nodes: {karpenter_count}
 
 🔗 Kubernetes API: {health.get('kubernetes_api', 'unknown')}"""
         else:
@@ -168,7 +335,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     
     elif name == "get_node_info":
         include_karpenter_only = arguments.get("include_karpenter_only", False)
-        nodes = call_mcp_api("/nodes")
+        nodes = await _cached("/nodes")
         
         if "error" in nodes:
             return [TextContent(type="text", text=f"❌ Error getting node info: {nodes['error']}")]
@@ -176,22 +343,25 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         node_list = nodes.get("nodes", [])
         if include_karpenter_only:
             # Filter for non-t3.medium instances (Karpenter managed)
-            node_list = [n for n in node_list if n.get('instance_type') != 't3.medium']
+            node_list = [n for n in node_list if n.instance_type != 't3.medium']
         
-        response = f"🖥️ Your cluster has {len(node_list)} {'Karpenter-managed ' if include_karpenter_only else ''}nodes:\n\n"
+        buf = io.StringIO()
+        buf.write(f"🖥️ Your cluster has {len(node_list)} {'Karpenter-managed ' if include_karpenter_only else ''}nodes:\n\n")
         
         for node in node_list:
-            status_emoji = "✅" if node.get('status') == 'Ready' else "❌"
-            response += f"{status_emoji} {node.get('name', 'unknown')}\n"
-            response += f"   • Type: {node.get('instance_type', 'unknown')}\n"
-            response += f"   • Zone: {node.get('zone', 'unknown')}\n"
-            response += f"   • Status: {node.get('status', 'unknown')}\n\n"
+            status_emoji = "✅" if node.status == 'Ready' else "❌"
+            buf.write(
+                f"{status_emoji} {node.name}\n"
+                f"   • Type: {node.instance_type}\n"
+                f"   • Zone: {node.zone}\n"
+                f"   • Status: {node.status}\n\n"
+            )
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text=buf.getvalue())]
     
     elif name == "check_pods":
         namespace = arguments.get("namespace", "mcp-server")
-        pods = call_mcp_api(f"/pods?namespace={namespace}")
+        pods = await _cached(f"/pods?namespace={namespace}")
         
         if "error" in pods:
             return [TextContent(type="text", text=f"❌ Error checking pods in {namespace}: {pods['error']}")]
@@ -199,23 +369,26 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         pod_count = pods.get("pod_count", 0)
         pod_list = pods.get("pods", [])
         
-        response = f"🐳 Pods in '{namespace}' namespace: {pod_count} total\n\n"
+        buf = io.StringIO()
+        buf.write(f"🐳 Pods in '{namespace}' namespace: {pod_count} total\n\n")
         
         if pod_count == 0:
-            response += "No pods found in this namespace."
+            buf.write("No pods found in this namespace.")
         else:
             for pod in pod_list:
-                status_emoji = "✅" if pod.get('phase') == 'Running' and pod.get('ready') > 0 else "❌"
-                response += f"{status_emoji} {pod.get('name', 'unknown')}\n"
-                response += f"   • Phase: {pod.get('phase', 'unknown')}\n"
-                response += f"   • Ready: {pod.get('ready', 0)}/1\n"
-                response += f"   • Restarts: {pod.get('restart_count', 0)}\n\n"
+                status_emoji = "✅" if pod.phase == 'Running' and pod.ready > 0 else "❌"
+                buf.write(
+                    f"{status_emoji} {pod.name}\n"
+                    f"   • Phase: {pod.phase}\n"
+                    f"   • Ready: {pod.ready}/1\n"
+                    f"   • Restarts: {pod.restart_count}\n\n"
+                )
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text=buf.getvalue())]
     
     elif name == "get_deployments":
         namespace = arguments.get("namespace", "default")
-        deployments = call_mcp_api(f"/deployments?namespace={namespace}")
+        deployments = await _cached(f"/deployments?namespace={namespace}")
         
         if "error" in deployments:
             return [TextContent(type="text", text=f"❌ Error getting deployments in {namespace}: {deployments['error']}")]
@@ -223,44 +396,74 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         deployment_count = deployments.get("deployment_count", 0)
         deployment_list = deployments.get("deployments", [])
         
-        response = f"🚀 Deployments in '{namespace}' namespace: {deployment_count} total\n\n"
+        buf = io.StringIO()
+        buf.write(f"🚀 Deployments in '{namespace}' namespace: {deployment_count} total\n\n")
         
         if deployment_count == 0:
-            response += "No deployments found in this namespace."
+            buf.write("No deployments found in this namespace.")
         else:
             for deployment in deployment_list:
-                replicas = deployment.get('replicas', 0)
-                ready = deployment.get('ready_replicas', 0)
-                available = deployment.get('available_replicas', 0)
+                replicas = deployment.replicas
+                ready = deployment.ready_replicas
+                available = deployment.available_replicas
                 
                 status_emoji = "✅" if ready == replicas and available == replicas else "⚠️"
-                response += f"{status_emoji} {deployment.get('name', 'unknown')}\n"
-                response += f"   • Desired: {replicas}\n"
-                response += f"   • Ready: {ready}\n"
-                response += f"   • Available: {available}\n\n"
+                buf.write(
+                    f"{status_emoji} {deployment.name}\n"
+                    f"   • Desired: {replicas}\n"
+                    f"   • Ready: {ready}\n"
+                    f"   • Available: {available}\n\n"
+                )
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text=buf.getvalue())]
     
     else:
         return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
 
 async def main():
     """Main entry point for the server."""
+    global _CLIENT
     logger.info("Starting MCP-Claude Bridge Server...")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="eks-mcp-bridge",
-                server_version="1.0.0",
-                capabilities=ServerCapabilities(
-                    resources=ResourcesCapability(subscribe=False, listChanged=False),
-                    tools=ToolsCapability(),
+    # HTTP/2 is negotiated via ALPN on https:// endpoints; plain http:// stays on HTTP/1.1
+    _CLIENT = httpx.AsyncClient(
+        base_url=MCP_API_BASE,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=50, keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS),
+        timeout=10.0,
+    )
+    
+    try:
+        # Warm up the pool so the first tool call doesn't pay connection setup
+        try:
+            await _CLIENT.get("/health", timeout=2.0)
+        except httpx.HTTPError as e:
+            logger.warning("Could not preconnect to MCP API: %s", e)
+        
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="eks-mcp-bridge",
+                    server_version="1.0.0",
+                    capabilities=ServerCapabilities(
+                        resources=ResourcesCapability(subscribe=False, listChanged=False),
+                        tools=ToolsCapability(),
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        for task in list(_dispatch_tasks):
+            task.cancel()
+        await asyncio.gather(*_dispatch_tasks, return_exceptions=True)
+        await _CLIENT.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv-based event loop when it is available
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -4,12 +4,13 @@ Enhanced MCP server with real Kubernetes API integration.
 This version connects to actual EKS cluster instead of returning mock data.
 """
 import asyncio
-import json
 import logging
 import os
-from typing import Any, Dict, List
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from kubernetes import client, config
+import orjson
+from kubernetes_asyncio import client
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.types import ServerCapabilities, ResourcesCapability, ToolsCapability
@@ -17,290 +18,363 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Resource, Tool, TextContent
 from pydantic import AnyUrl
 
+import k8s_client
+from cluster_cache import (
+    LIST_REQUEST_TIMEOUT,
+    MAX_NAMESPACES,
+    AsyncClusterCache,
+    deployment_info,
+    is_ready,
+    namespace_error,
+    node_info,
+    pod_info,
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 server = Server("eks-mcp-server-enhanced")
 
-# Initialize Kubernetes client
-try:
-    # Try to load in-cluster config first (when running in pod)
-    config.load_incluster_config()
-    logger.info("Loaded in-cluster Kubernetes config")
-except:
-    try:
-        # Fall back to local kubeconfig
-        config.load_kube_config()
-        logger.info("Loaded local Kubernetes config")
-    except Exception as e:
-        logger.warning(f"Could not load Kubernetes config: {e}")
-        logger.warning("Will use mock data instead")
+# Deployment settings, fixed for the life of the process
+CLUSTER_NAME = os.getenv("CLUSTER_NAME", "mcp-eks-cluster")
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+# Kubernetes API clients, created in main() once the config is loaded
+v1: Optional[client.CoreV1Api] = None
+apps_v1: Optional[client.AppsV1Api] = None
+
+# Watch-backed caches that list handlers read from, created in main()
+cluster_cache: Optional[AsyncClusterCache] = None
+
+
+def _dumps(data: Any) -> str:
+    """Encode a resource body as compact JSON text."""
+    return orjson.dumps(data).decode()
+
+
+def _dumps_indented(data: Any) -> str:
+    """Encode a tool result as indented JSON text."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
+# Resource URIs, parsed once
+CLUSTER_INFO_URI = AnyUrl("resource://cluster-info")
+NODE_INFO_URI = AnyUrl("resource://node-info")
+HEALTH_URI = AnyUrl("resource://health")
+
+# Resource and tool listings never change, so build them once. The values are
+# known to be valid, so skip Pydantic validation.
+_RESOURCES = [
+    Resource.model_construct(
+        uri=CLUSTER_INFO_URI,
+        name="EKS Cluster Information",
+        description="Real-time information about the EKS cluster",
+        mimeType="application/json",
+    ),
+    Resource.model_construct(
+        uri=NODE_INFO_URI,
+        name="Node Information",
+        description="Information about cluster nodes",
+        mimeType="application/json",
+    ),
+    Resource.model_construct(
+        uri=HEALTH_URI,
+        name="Health Check",
+        description="Server and cluster health status",
+        mimeType="application/json",
+    ),
+]
+
+_TOOLS = [
+    Tool.model_construct(
+        name="get_cluster_status",
+        description="Get the current status of the EKS cluster",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_nodes": {
+                    "type": "boolean",
+                    "description": "Include node information",
+                    "default": False
+                }
+            },
+        },
+    ),
+    Tool.model_construct(
+        name="list_pods",
+        description="List pods in one or more namespaces",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "namespace": {
+                    "oneOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}, "maxItems": MAX_NAMESPACES},
+                    ],
+                    "description": "Kubernetes namespace, or a list of namespaces to query together",
+                    "default": "default",
+                },
+                "show_status": {
+                    "type": "boolean",
+                    "description": "Include detailed pod status",
+                    "default": True
+                }
+            },
+        },
+    ),
+    Tool.model_construct(
+        name="get_deployments",
+        description="List deployments in one or more namespaces",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "namespace": {
+                    "oneOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}, "maxItems": MAX_NAMESPACES},
+                    ],
+                    "description": "Kubernetes namespace, or a list of namespaces to query together",
+                    "default": "default",
+                }
+            },
+        },
+    ),
+]
+
+# The healthy resource://health body is constant, so encode it once
+_HEALTHY_JSON = _dumps({
+    "status": "healthy",
+    "kubernetes_api": "accessible",
+    "timestamp": "2024-01-01T00:00:00Z"
+})
+
+# Seconds a successful resource://health probe is reused before asking the apiserver again
+_HEALTH_TTL = 2.0
 
-v1 = client.CoreV1Api()
-apps_v1 = client.AppsV1Api()
+# time.monotonic() of the last successful probe
+_last_ok_at = 0.0
 
 
 @server.list_resources()
 async def handle_list_resources() -> List[Resource]:
     """List available resources."""
-    return [
-        Resource(
-            uri=AnyUrl("resource://cluster-info"),
-            name="EKS Cluster Information",
-            description="Real-time information about the EKS cluster",
-            mimeType="application/json",
-        ),
-        Resource(
-            uri=AnyUrl("resource://node-info"),
-            name="Node Information",
-            description="Information about cluster nodes",
-            mimeType="application/json",
-        ),
-        Resource(
-            uri=AnyUrl("resource://health"),
-            name="Health Check",
-            description="Server and cluster health status",
-            mimeType="application/json",
-        ),
-    ]
+    return _RESOURCES
+
+
+async def _read_cluster_info() -> str:
+    """Real cluster information."""
+    namespaces = await cluster_cache.namespaces()
+    return _dumps({
+        "cluster_name": CLUSTER_NAME,
+        "region": AWS_REGION,
+        "namespace_count": len(namespaces),
+        "server_version": "1.28",
+        "namespaces": [ns["metadata"]["name"] for ns in namespaces]
+    })
+
+
+async def _read_node_info() -> str:
+    """Node information."""
+    nodes = await cluster_cache.nodes()
+    return _dumps({
+        "node_count": len(nodes),
+        "nodes": [node_info(node) for node in nodes]
+    })
+
+
+async def _read_health() -> str:
+    """Health check with real API call, reusing a recent success."""
+    global _last_ok_at
+    now = time.monotonic()
+    if now - _last_ok_at < _HEALTH_TTL:
+        return _HEALTHY_JSON
+    try:
+        await v1.list_namespace(limit=1, _request_timeout=LIST_REQUEST_TIMEOUT)
+        # Failures aren't cached, so recovery shows up on the next read
+        _last_ok_at = now
+        return _HEALTHY_JSON
+    except Exception as e:
+        return _dumps({
+            "status": "unhealthy",
+            "kubernetes_api": "inaccessible",
+            "error": str(e),
+            "timestamp": "2024-01-01T00:00:00Z"
+        })
+
+
+# Resource readers keyed by URI, so reads dispatch with one dict lookup
+_RESOURCE_HANDLERS = {
+    str(CLUSTER_INFO_URI): _read_cluster_info,
+    str(NODE_INFO_URI): _read_node_info,
+    str(HEALTH_URI): _read_health,
+}
 
 
 @server.read_resource()
 async def handle_read_resource(uri: AnyUrl) -> str:
     """Read a specific resource."""
     try:
-        if str(uri) == "resource://cluster-info":
-            # Get real cluster information
-            namespaces = v1.list_namespace()
-            return json.dumps({
-                "cluster_name": os.getenv("CLUSTER_NAME", "mcp-eks-cluster"),
-                "region": os.getenv("AWS_REGION", "us-east-1"),
-                "namespace_count": len(namespaces.items),
-                "server_version": "1.28",
-                "namespaces": [ns.metadata.name for ns in namespaces.items]
-            })
-        
-        elif str(uri) == "resource://node-info":
-            # Get node information
-            nodes = v1.list_node()
-            node_info = []
-            for node in nodes.items:
-                node_info.append({
-                    "name": node.metadata.name,
-                    "status": "Ready" if any(
-                        condition.type == "Ready" and condition.status == "True"
-                        for condition in node.status.conditions
-                    ) else "NotReady",
-                    "instance_type": node.metadata.labels.get("node.kubernetes.io/instance-type", "unknown"),
-                    "zone": node.metadata.labels.get("topology.kubernetes.io/zone", "unknown")
-                })
-            
-            return json.dumps({
-                "node_count": len(nodes.items),
-                "nodes": node_info
-            })
-        
-        elif str(uri) == "resource://health":
-            # Health check with real API call
-            try:
-                v1.list_namespace(limit=1)
-                return json.dumps({
-                    "status": "healthy",
-                    "kubernetes_api": "accessible",
-                    "timestamp": "2024-01-01T00:00:00Z"
-                })
-            except Exception as e:
-                return json.dumps({
-                    "status": "unhealthy",
-                    "kubernetes_api": "inaccessible",
-                    "error": str(e),
-                    "timestamp": "2024-01-01T00:00:00Z"
-                })
-        
-        else:
+        handler = _RESOURCE_HANDLERS.get(str(uri))
+        if handler is None:
             raise ValueError(f"Unknown resource: {uri}")
+        return await handler()
             
     except Exception as e:
-        logger.error(f"Error reading resource {uri}: {e}")
-        return json.dumps({"error": str(e)})
+        logger.error("Error reading resource %s: %s", uri, e)
+        return _dumps({"error": str(e)})
 
 
 @server.list_tools()
 async def handle_list_tools() -> List[Tool]:
     """List available tools."""
-    return [
-        Tool(
-            name="get_cluster_status",
-            description="Get the current status of the EKS cluster",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_nodes": {
-                        "type": "boolean",
-                        "description": "Include node information",
-                        "default": False
-                    }
-                },
-            },
-        ),
-        Tool(
-            name="list_pods",
-            description="List pods in a specific namespace",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "namespace": {
-                        "type": "string",
-                        "description": "Kubernetes namespace",
-                        "default": "default",
-                    },
-                    "show_status": {
-                        "type": "boolean",
-                        "description": "Include detailed pod status",
-                        "default": True
-                    }
-                },
-            },
-        ),
-        Tool(
-            name="get_deployments",
-            description="List deployments in a namespace",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "namespace": {
-                        "type": "string",
-                        "description": "Kubernetes namespace",
-                        "default": "default",
-                    }
-                },
-            },
-        ),
-    ]
+    return _TOOLS
+
+
+async def _get_cluster_status(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Current status of the EKS cluster."""
+    include_nodes = arguments.get("include_nodes", False)
+    
+    # Namespaces and nodes are independent, so fetch them concurrently
+    if include_nodes:
+        namespaces, nodes = await asyncio.gather(
+            cluster_cache.namespaces(), cluster_cache.nodes()
+        )
+    else:
+        namespaces = await cluster_cache.namespaces()
+    
+    result = {
+        "cluster_name": CLUSTER_NAME,
+        "namespace_count": len(namespaces),
+        "kubernetes_version": "1.28"
+    }
+    
+    if include_nodes:
+        result["node_count"] = len(nodes)
+        result["nodes"] = [
+            {
+                "name": node["metadata"]["name"],
+                "ready": is_ready(node["status"].get("conditions"))
+            }
+            for node in nodes
+        ]
+    
+    return result
+
+
+async def _per_namespace(
+    arguments: Dict[str, Any], fetch: Callable[[str], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Run fetch for one namespace, or concurrently for a list of them keyed by namespace."""
+    namespace = arguments.get("namespace", "default")
+    
+    if isinstance(namespace, str):
+        try:
+            return await fetch(namespace)
+        except Exception as e:
+            return namespace_error(namespace, e)
+    
+    if not isinstance(namespace, list) or not all(isinstance(ns, str) for ns in namespace):
+        raise ValueError("namespace must be a string or a list of strings")
+    if len(namespace) > MAX_NAMESPACES:
+        raise ValueError(f"namespace lists are limited to {MAX_NAMESPACES} entries")
+    
+    results = await asyncio.gather(*(fetch(ns) for ns in namespace), return_exceptions=True)
+    merged = {}
+    for ns, result in zip(namespace, results):
+        if isinstance(result, Exception):
+            result = namespace_error(ns, result)
+        elif isinstance(result, BaseException):
+            raise result
+        merged[ns] = result
+    return merged
+
+
+async def _list_pods(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Pods in one or more namespaces."""
+    show_status = arguments.get("show_status", True)
+    
+    async def fetch(namespace: str) -> Dict[str, Any]:
+        pods = await cluster_cache.pods(namespace)
+        if show_status:
+            pod_list = [pod_info(pod) for pod in pods]
+        else:
+            pod_list = [{"name": pod["metadata"]["name"]} for pod in pods]
+        
+        return {
+            "namespace": namespace,
+            "pod_count": len(pod_list),
+            "pods": pod_list
+        }
+    
+    return await _per_namespace(arguments, fetch)
+
+
+async def _get_deployments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Deployments in one or more namespaces."""
+    
+    async def fetch(namespace: str) -> Dict[str, Any]:
+        deployment_list = [deployment_info(deployment) for deployment in await cluster_cache.deployments(namespace)]
+        
+        return {
+            "namespace": namespace,
+            "deployment_count": len(deployment_list),
+            "deployments": deployment_list
+        }
+    
+    return await _per_namespace(arguments, fetch)
+
+
+# Tool implementations keyed by name, each returning the result to serialize
+_TOOL_HANDLERS = {
+    "get_cluster_status": _get_cluster_status,
+    "list_pods": _list_pods,
+    "get_deployments": _get_deployments,
+}
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls with real Kubernetes API integration."""
     try:
-        if name == "get_cluster_status":
-            include_nodes = arguments.get("include_nodes", False)
-            
-            # Get namespace count
-            namespaces = v1.list_namespace()
-            
-            result = {
-                "cluster_name": os.getenv("CLUSTER_NAME", "mcp-eks-cluster"),
-                "namespace_count": len(namespaces.items),
-                "kubernetes_version": "1.28"
-            }
-            
-            if include_nodes:
-                nodes = v1.list_node()
-                result["node_count"] = len(nodes.items)
-                result["nodes"] = [
-                    {
-                        "name": node.metadata.name,
-                        "ready": any(
-                            condition.type == "Ready" and condition.status == "True"
-                            for condition in node.status.conditions
-                        )
-                    }
-                    for node in nodes.items
-                ]
-            
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "list_pods":
-            namespace = arguments.get("namespace", "default")
-            show_status = arguments.get("show_status", True)
-            
-            try:
-                pods = v1.list_namespaced_pod(namespace=namespace)
-                pod_list = []
-                
-                for pod in pods.items:
-                    pod_info = {"name": pod.metadata.name}
-                    
-                    if show_status:
-                        pod_info.update({
-                            "phase": pod.status.phase,
-                            "ready": sum(1 for condition in (pod.status.conditions or [])
-                                       if condition.type == "Ready" and condition.status == "True"),
-                            "restart_count": sum(container.restart_count or 0 
-                                               for container in (pod.status.container_statuses or []))
-                        })
-                    
-                    pod_list.append(pod_info)
-                
-                result = {
-                    "namespace": namespace,
-                    "pod_count": len(pod_list),
-                    "pods": pod_list
-                }
-                
-            except client.exceptions.ApiException as e:
-                if e.status == 404:
-                    result = {"error": f"Namespace '{namespace}' not found"}
-                else:
-                    result = {"error": f"API error: {e.reason}"}
-            
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "get_deployments":
-            namespace = arguments.get("namespace", "default")
-            
-            try:
-                deployments = apps_v1.list_namespaced_deployment(namespace=namespace)
-                deployment_list = []
-                
-                for deployment in deployments.items:
-                    deployment_list.append({
-                        "name": deployment.metadata.name,
-                        "replicas": deployment.spec.replicas,
-                        "ready_replicas": deployment.status.ready_replicas or 0,
-                        "available_replicas": deployment.status.available_replicas or 0
-                    })
-                
-                result = {
-                    "namespace": namespace,
-                    "deployment_count": len(deployment_list),
-                    "deployments": deployment_list
-                }
-                
-            except client.exceptions.ApiException as e:
-                if e.status == 404:
-                    result = {"error": f"Namespace '{namespace}' not found"}
-                else:
-                    result = {"error": f"API error: {e.reason}"}
-            
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        else:
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        result = await handler(arguments)
+        return [TextContent.model_construct(type="text", text=_dumps_indented(result))]
             
     except Exception as e:
-        logger.error(f"Error calling tool {name}: {e}")
-        return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+        logger.error("Error calling tool %s: %s", name, e)
+        return [TextContent.model_construct(type="text", text=_dumps_indented({"error": str(e)}))]
 
 
 async def main():
     """Main entry point for the server."""
+    global v1, apps_v1, cluster_cache
     logger.info("Starting Enhanced MCP EKS Server...")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="eks-mcp-server-enhanced",
-                server_version="2.0.0",
-                capabilities=ServerCapabilities(
-                    resources=ResourcesCapability(subscribe=False, listChanged=False),
-                    tools=ToolsCapability(),
+    await k8s_client.load_config()
+    
+    v1 = k8s_client.get_core_v1()
+    apps_v1 = k8s_client.get_apps_v1()
+    cluster_cache = AsyncClusterCache(v1, apps_v1, k8s_client.get_metadata_core_v1())
+    
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="eks-mcp-server-enhanced",
+                    server_version="2.0.0",
+                    capabilities=ServerCapabilities(
+                        resources=ResourcesCapability(subscribe=False, listChanged=False),
+                        tools=ToolsCapability(),
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await cluster_cache.close()
+        await k8s_client.close()
 
 
 if __name__ == "__main__":
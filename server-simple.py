@@ -3,207 +3,269 @@
 Simple HTTP server that provides MCP-like functionality via REST API.
 This version is designed to run in Kubernetes pods.
 """
-import json
+import asyncio
+import contextlib
+import hashlib
 import logging
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Any, Dict
-from urllib.parse import urlparse, parse_qs
+from typing import Any, Dict, Optional
 
-from kubernetes import client, config
+import orjson
+import uvicorn
+from kubernetes_asyncio import client
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
 
-logging.basicConfig(level=logging.INFO)
+import k8s_client
+from cluster_cache import (
+    LIST_REQUEST_TIMEOUT,
+    MAX_NAMESPACES,
+    AsyncClusterCache,
+    deployment_info,
+    namespace_error,
+    node_info,
+    pod_info,
+)
+
+logging.basicConfig(level=(os.getenv("LOG_LEVEL") or "INFO").upper())
 logger = logging.getLogger(__name__)
 
-# Initialize Kubernetes client
-try:
-    # Try to load in-cluster config first (when running in pod)
-    config.load_incluster_config()
-    logger.info("Loaded in-cluster Kubernetes config")
-except:
+# Deployment settings, fixed for the life of the process
+CLUSTER_NAME = os.getenv("CLUSTER_NAME", "mcp-eks-cluster")
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+PORT = int(os.getenv("PORT", "8080"))
+
+# Kubernetes API clients, created at startup once the config is loaded
+v1: Optional[client.CoreV1Api] = None
+apps_v1: Optional[client.AppsV1Api] = None
+
+# Watch-backed caches that list endpoints read from, created at startup
+cluster_cache: Optional[AsyncClusterCache] = None
+
+
+# Seconds between background Kubernetes API probes backing /health
+HEALTH_CHECK_INTERVAL = 10
+
+# Seconds an idle client connection is kept open. Longer than the AWS load
+# balancer's 60s idle timeout, so the balancer (not us) closes idle connections
+# and never sends a request down a socket we are closing.
+KEEP_ALIVE_SECONDS = 65
+
+
+def _dumps(data: Any) -> bytes:
+    """Encode a response body as indented JSON bytes."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
+# The healthy /health body never changes, so encode it once
+_HEALTHY: Dict[str, Any] = {
+    "status": "healthy",
+    "kubernetes_api": "accessible",
+    "server": "mcp-eks-server"
+}
+_HEALTHY_BYTES = _dumps(_HEALTHY)
+
+# Latest probe result, replaced wholesale by the health check task
+_health: Dict[str, Any] = {
+    "status": "unhealthy",
+    "kubernetes_api": "unknown",
+    "server": "mcp-eks-server"
+}
+
+
+async def probe_kubernetes_api():
+    """Test Kubernetes API connectivity and record the result for /health."""
+    global _health
+    try:
+        await v1.list_namespace(limit=1, _request_timeout=LIST_REQUEST_TIMEOUT)
+        _health = _HEALTHY
+    except Exception as e:
+        _health = {
+            "status": "unhealthy",
+            "kubernetes_api": "inaccessible",
+            "error": str(e)
+        }
+
+
+async def health_check_loop():
+    """Refresh the cached health status until the server shuts down."""
+    while True:
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+        await probe_kubernetes_api()
+
+
+def json_response(request: Request, data: Dict[str, Any], status: int = 200) -> Response:
+    """Build a JSON response."""
+    return json_body_response(request, _dumps(data), status)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header lists etag, using weak comparison."""
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+
+def json_body_response(request: Request, body: bytes, status: int = 200) -> Response:
+    """Build a response from an encoded JSON body, answering 304 when the client already has it."""
+    headers = {"Access-Control-Allow-Origin": "*"}
+    if status == 200:
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    return Response(body, status_code=status, media_type="application/json", headers=headers)
+
+
+async def handle_health(request: Request) -> Response:
+    """Health check endpoint, served from the last background probe."""
+    health = _health
+    if health is _HEALTHY:
+        return json_body_response(request, _HEALTHY_BYTES)
+    return json_response(request, health, status=500)
+
+
+async def handle_cluster_info(request: Request) -> Response:
+    """Get cluster information."""
+    try:
+        namespaces = await cluster_cache.namespaces()
+        response = {
+            "cluster_name": CLUSTER_NAME,
+            "region": AWS_REGION,
+            "namespace_count": len(namespaces),
+            "namespaces": [ns["metadata"]["name"] for ns in namespaces]
+        }
+        return json_response(request, response)
+    except Exception as e:
+        return json_response(request, {"error": str(e)}, status=500)
+
+
+async def handle_nodes(request: Request) -> Response:
+    """Get node information."""
+    try:
+        nodes = await cluster_cache.nodes()
+        response = {
+            "node_count": len(nodes),
+            "nodes": [node_info(node) for node in nodes]
+        }
+        return json_response(request, response)
+    except Exception as e:
+        return json_response(request, {"error": str(e)}, status=500)
+
+
+async def handle_pods(request: Request) -> Response:
+    """Get pod information for one namespace, or several via ?namespaces=a,b."""
+    if "namespaces" in request.query_params:
+        namespaces = [ns for ns in request.query_params["namespaces"].split(",") if ns]
+        return await handle_pods_multi(request, namespaces)
+
+    namespace = request.query_params.get("namespace", "default")
+    try:
+        pod_list = [pod_info(pod) for pod in await cluster_cache.pods(namespace)]
+        response = {
+            "namespace": namespace,
+            "pod_count": len(pod_list),
+            "pods": pod_list
+        }
+        return json_response(request, response)
+    except Exception as e:
+        return json_response(request, namespace_error(namespace, e), status=500)
+
+
+async def handle_pods_multi(request: Request, namespaces) -> Response:
+    """Get pod information for several namespaces in one response, with errors reported per namespace."""
+    if len(namespaces) > MAX_NAMESPACES:
+        return json_response(
+            request, {"error": f"namespaces is limited to {MAX_NAMESPACES} entries"}, status=400
+        )
+
+    results = await asyncio.gather(*(cluster_cache.pods(ns) for ns in namespaces), return_exceptions=True)
+    response = {}
+    for ns, pods in zip(namespaces, results):
+        if isinstance(pods, Exception):
+            response[ns] = namespace_error(ns, pods)
+            continue
+        if isinstance(pods, BaseException):
+            raise pods
+        pod_list = [pod_info(pod) for pod in pods]
+        response[ns] = {
+            "namespace": ns,
+            "pod_count": len(pod_list),
+            "pods": pod_list
+        }
+    return json_response(request, response)
+
+
+async def handle_deployments(request: Request) -> Response:
+    """Get deployment information for a namespace."""
+    namespace = request.query_params.get("namespace", "default")
     try:
-        # Fall back to local kubeconfig
-        config.load_kube_config()
-        logger.info("Loaded local Kubernetes config")
+        deployment_list = [deployment_info(deployment) for deployment in await cluster_cache.deployments(namespace)]
+        response = {
+            "namespace": namespace,
+            "deployment_count": len(deployment_list),
+            "deployments": deployment_list
+        }
+        return json_response(request, response)
     except Exception as e:
-        logger.warning(f"Could not load Kubernetes config: {e}")
-
-v1 = client.CoreV1Api()
-apps_v1 = client.AppsV1Api()
-
-
-class MCPHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        """Handle GET requests."""
-        try:
-            parsed_path = urlparse(self.path)
-            path = parsed_path.path
-            query_params = parse_qs(parsed_path.query)
-            
-            if path == '/health':
-                self.handle_health()
-            elif path == '/cluster-info':
-                self.handle_cluster_info()
-            elif path == '/nodes':
-                self.handle_nodes()
-            elif path == '/pods':
-                namespace = query_params.get('namespace', ['default'])[0]
-                self.handle_pods(namespace)
-            elif path == '/deployments':
-                namespace = query_params.get('namespace', ['default'])[0]
-                self.handle_deployments(namespace)
-            else:
-                self.send_error(404, "Not Found")
-                
-        except Exception as e:
-            logger.error(f"Error handling request: {e}")
-            self.send_error(500, str(e))
-    
-    def handle_health(self):
-        """Health check endpoint."""
-        try:
-            # Test Kubernetes API connectivity
-            v1.list_namespace(limit=1)
-            response = {
-                "status": "healthy",
-                "kubernetes_api": "accessible",
-                "server": "mcp-eks-server"
-            }
-            self.send_json_response(response)
-        except Exception as e:
-            response = {
-                "status": "unhealthy",
-                "kubernetes_api": "inaccessible",
-                "error": str(e)
-            }
-            self.send_json_response(response, status=500)
-    
-    def handle_cluster_info(self):
-        """Get cluster information."""
-        try:
-            namespaces = v1.list_namespace()
-            response = {
-                "cluster_name": os.getenv("CLUSTER_NAME", "mcp-eks-cluster"),
-                "region": os.getenv("AWS_REGION", "us-east-1"),
-                "namespace_count": len(namespaces.items),
-                "namespaces": [ns.metadata.name for ns in namespaces.items]
-            }
-            self.send_json_response(response)
-        except Exception as e:
-            self.send_json_response({"error": str(e)}, status=500)
-    
-    def handle_nodes(self):
-        """Get node information."""
-        try:
-            nodes = v1.list_node()
-            node_info = []
-            for node in nodes.items:
-                node_info.append({
-                    "name": node.metadata.name,
-                    "status": "Ready" if any(
-                        condition.type == "Ready" and condition.status == "True"
-                        for condition in node.status.conditions
-                    ) else "NotReady",
-                    "instance_type": node.metadata.labels.get("node.kubernetes.io/instance-type", "unknown"),
-                    "zone": node.metadata.labels.get("topology.kubernetes.io/zone", "unknown")
-                })
-            
-            response = {
-                "node_count": len(nodes.items),
-                "nodes": node_info
-            }
-            self.send_json_response(response)
-        except Exception as e:
-            self.send_json_response({"error": str(e)}, status=500)
-    
-    def handle_pods(self, namespace):
-        """Get pod information for a namespace."""
-        try:
-            pods = v1.list_namespaced_pod(namespace=namespace)
-            pod_list = []
-            
-            for pod in pods.items:
-                pod_info = {
-                    "name": pod.metadata.name,
-                    "phase": pod.status.phase,
-                    "ready": sum(1 for condition in (pod.status.conditions or [])
-                               if condition.type == "Ready" and condition.status == "True"),
-                    "restart_count": sum(container.restart_count or 0 
-                                       for container in (pod.status.container_statuses or []))
-                }
-                pod_list.append(pod_info)
-            
-            response = {
-                "namespace": namespace,
-                "pod_count": len(pod_list),
-                "pods": pod_list
-            }
-            self.send_json_response(response)
-        except client.exceptions.ApiException as e:
-            if e.status == 404:
-                response = {"error": f"Namespace '{namespace}' not found"}
-            else:
-                response = {"error": f"API error: {e.reason}"}
-            self.send_json_response(response, status=500)
-        except Exception as e:
-            self.send_json_response({"error": str(e)}, status=500)
-    
-    def handle_deployments(self, namespace):
-        """Get deployment information for a namespace."""
-        try:
-            deployments = apps_v1.list_namespaced_deployment(namespace=namespace)
-            deployment_list = []
-            
-            for deployment in deployments.items:
-                deployment_list.append({
-                    "name": deployment.metadata.name,
-                    "replicas": deployment.spec.replicas,
-                    "ready_replicas": deployment.status.ready_replicas or 0,
-                    "available_replicas": deployment.status.available_replicas or 0
-                })
-            
-            response = {
-                "namespace": namespace,
-                "deployment_count": len(deployment_list),
-                "deployments": deployment_list
-            }
-            self.send_json_response(response)
-        except client.exceptions.ApiException as e:
-            if e.status == 404:
-                response = {"error": f"Namespace '{namespace}' not found"}
-            else:
-                response = {"error": f"API error: {e.reason}"}
-            self.send_json_response(response, status=500)
-        except Exception as e:
-            self.send_json_response({"error": str(e)}, status=500)
-    
-    def send_json_response(self, data: Dict[str, Any], status: int = 200):
-        """Send JSON response."""
-        self.send_response(status)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
-    
-    def log_message(self, format, *args):
-        """Override to use our logger."""
-        logger.info(f"{self.address_string()} - {format % args}")
+        return json_response(request, namespace_error(namespace, e), status=500)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    """Set up the Kubernetes clients, caches and health probe for the app's lifetime."""
+    global v1, apps_v1, cluster_cache
+    await k8s_client.load_config()
+
+    v1 = k8s_client.get_core_v1()
+    apps_v1 = k8s_client.get_apps_v1()
+    cluster_cache = AsyncClusterCache(v1, apps_v1, k8s_client.get_metadata_core_v1())
+
+    await probe_kubernetes_api()
+    health_task = asyncio.create_task(health_check_loop())
+    try:
+        yield
+    finally:
+        health_task.cancel()
+        await asyncio.gather(health_task, return_exceptions=True)
+        await cluster_cache.close()
+        await k8s_client.close()
+
+
+app = Starlette(
+    routes=[
+        Route("/health", handle_health),
+        Route("/cluster-info", handle_cluster_info),
+        Route("/nodes", handle_nodes),
+        Route("/pods", handle_pods),
+        Route("/deployments", handle_deployments),
+    ],
+    lifespan=lifespan,
+)
 
 
 def main():
     """Main entry point."""
-    port = int(os.getenv('PORT', 8080))
-    
-    logger.info(f"Starting MCP EKS Server on port {port}...")
-    
-    server = HTTPServer(('0.0.0.0', port), MCPHandler)
-    
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Shutting down server...")
-        server.shutdown()
+    logger.info("Starting MCP EKS Server on port %d...", PORT)
+
+    # uvloop and httptools keep the event loop and HTTP parsing in C; log_config=None
+    # leaves uvicorn's loggers on the basicConfig above. With LOG_LEVEL above INFO,
+    # skip building access log records entirely.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        log_config=None,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        access_log=logging.getLogger("uvicorn.access").isEnabledFor(logging.INFO),
+    )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()